@@ -1,9 +1,16 @@
+import argparse
 import json
+from collections import Counter
+import glob
+import hashlib
+import itertools
 import pickle
 import logging
 from datetime import datetime
 import sys
 import os
+import uuid
+import numpy as np
 import pandas as pd
 from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
@@ -14,26 +21,44 @@ nltk.download('punkt')
 nltk.download('stopwords')
 
 class ProductAnalyzer:
-    def __init__(self, model_dir='model/', dataset_path='dataset/Datafiniti_Amazon_Consumer_Reviews_of_Amazon_Products.csv'):
-        """Initialize the analyzer with model directory and dataset path"""
+    def __init__(self, model_dir='model/', dataset_path='dataset/Datafiniti_Amazon_Consumer_Reviews_of_Amazon_Products.csv',
+                 model=None, vectorizer=None, model_info=None, reviews_df=None, output_dir='bot_data/'):
+        """Initialize the analyzer with model directory and dataset path
+
+        Already loaded model components and review DataFrame can be passed in
+        to skip reading them from disk again. Analyses are written to output_dir.
+        """
         self.model_dir = model_dir
         self.dataset_path = dataset_path
+        self.output_dir = output_dir
+        self.stop_words = set(stopwords.words('english'))
         self.setup_logging()
-        self.load_model_components()
-        self.load_product_database()
+        if model is None or vectorizer is None or model_info is None:
+            self.load_model_components()
+        else:
+            self.model = model
+            self.vectorizer = vectorizer
+            self.model_info = model_info
+        self.load_product_database(reviews_df)
 
     def setup_logging(self):
-        """Set up logging configuration"""
+        """Send this module's log records to bot_data/analyzer.log and the console
+
+        Handlers go on the module logger rather than the root logger, so
+        training and analysis keep separate logs when run in one process.
+        """
         os.makedirs('bot_data', exist_ok=True)
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('bot_data/analyzer.log'),
-                logging.StreamHandler()
-            ]
-        )
         self.logger = logging.getLogger(__name__)
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+            handler.close()
+
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        for handler in (logging.FileHandler('bot_data/analyzer.log'), logging.StreamHandler()):
+            handler.setFormatter(formatter)
+            self.logger.addHandler(handler)
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
 
     def load_model_components(self):
         """Load the trained model and vectorizer"""
@@ -49,11 +74,12 @@ class ProductAnalyzer:
             self.logger.error(f'Error loading model components: {str(e)}')
             raise
 
-    def load_product_database(self):
+    def load_product_database(self, df=None):
         """Load product names and reviews from the dataset"""
         try:
             self.logger.info('Loading product database...')
-            df = pd.read_csv(self.dataset_path)
+            if df is None:
+                df = pd.read_csv(self.dataset_path)
             
             # Log initial dataset size
             self.logger.info(f'Initial dataset size: {len(df)} rows')
@@ -168,13 +194,51 @@ class ProductAnalyzer:
         try:
             text = str(text).lower()
             words = word_tokenize(text)
-            stop_words = set(stopwords.words('english'))
-            words = [word for word in words if word.isalpha() and word not in stop_words]
+            words = [word for word in words if word.isalpha() and word not in self.stop_words]
             return ' '.join(words)
         except Exception as e:
             self.logger.error(f'Error in text preprocessing: {str(e)}')
             return text
 
+    def score_reviews(self, reviews):
+        """Preprocess, vectorize and score a batch of reviews in one pass"""
+        processed_reviews = [self.preprocess_text(review) for review in reviews]
+
+        try:
+            # Score the whole batch with one transform and one predict_proba call
+            vectorized = self.vectorizer.transform(processed_reviews)
+            probabilities = self.model.predict_proba(vectorized)
+            best = probabilities.argmax(axis=1)
+            predictions = self.model.classes_[best]
+            confidences = probabilities[np.arange(len(best)), best]
+        except Exception as e:
+            self.logger.error(f'Error analyzing reviews: {str(e)}')
+            return None
+
+        return processed_reviews, vectorized, predictions, confidences
+
+    def iter_scored_reviews(self, reviews, chunk_size=1000):
+        """Yield scored chunks of reviews so only one chunk is held at a time"""
+        for start in range(0, len(reviews), chunk_size):
+            chunk = reviews[start:start + chunk_size]
+            scored = self.score_reviews(chunk)
+            if scored is None:
+                continue
+            yield (chunk,) + scored
+
+    def build_results(self, reviews, processed_reviews, predictions, confidences):
+        """Build per-review detail records for a scored batch"""
+        for review, processed_review, prediction, confidence in zip(
+            reviews, processed_reviews, predictions, confidences
+        ):
+            yield {
+                'review': review,
+                'review_hash': self.review_hash(review),
+                'processed': processed_review,
+                'sentiment': prediction,
+                'confidence': float(confidence)
+            }
+
     def analyze_reviews(self, reviews):
         """Analyze a list of reviews"""
         results = []
@@ -183,30 +247,327 @@ class ProductAnalyzer:
             'neutral': 0,
             'negative': 0
         }
-        
+
+        scored = self.score_reviews(reviews)
+        if scored is None:
+            return results, sentiment_counts, {}, None
+        processed_reviews, vectorized, predictions, confidences = scored
+
+        for result in self.build_results(reviews, processed_reviews, predictions, confidences):
+            sentiment_counts[result['sentiment']] += 1
+            results.append(result)
+
+        insights, insight_state = self.extract_insights(vectorized, predictions)
+
+        return results, sentiment_counts, insights, insight_state
+
+    def analyze_reviews_streaming(self, product_id, reviews, chunk_size=1000, previous=None):
+        """Analyze reviews chunk by chunk, streaming detail records to a JSON Lines file
+
+        When a reusable previous analysis is given, its records are copied into
+        the new file line by line and only reviews not covered by it are scored.
+        """
+        sentiment_counts = {
+            'positive': 0,
+            'neutral': 0,
+            'negative': 0
+        }
+        insight_state = None
+        confidence_total = 0.0
+        total = 0
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        details_file = f'{self.output_dir}details_{product_id}_{self.output_token()}.jsonl'
+
+        with open(details_file, 'w') as f:
+            if previous is not None:
+                known_counts = Counter()
+                for result in self.iter_previous_results(previous):
+                    known_counts[result['review_hash']] += 1
+                    sentiment_counts[result['sentiment']] += 1
+                    confidence_total += result['confidence']
+                    f.write(json.dumps(result) + '\n')
+                total = sum(known_counts.values())
+
+                # Counts come from the copied records, so they always match the details file
+                if previous['summary']['review_counts'] != sentiment_counts:
+                    self.logger.warning('Previous summary does not match its details, using the detail records')
+
+                insight_state = self.load_insight_state(previous)
+                if insight_state is None:
+                    insight_state = self.rebuild_insight_state(self.iter_previous_results(previous), chunk_size)
+
+                reviews = self.find_new_reviews(reviews, known_counts)
+                self.logger.info(f'{len(reviews)} new reviews since last analysis ({total} already scored)')
+
+            if insight_state is None:
+                insight_state = self.new_insight_state()
+
+            for chunk, processed_reviews, vectorized, predictions, confidences in self.iter_scored_reviews(reviews, chunk_size):
+                for result in self.build_results(chunk, processed_reviews, predictions, confidences):
+                    sentiment_counts[result['sentiment']] += 1
+                    confidence_total += result['confidence']
+                    total += 1
+                    f.write(json.dumps(result) + '\n')
+
+                self.accumulate_class_sums(vectorized, predictions, insight_state)
+
+        avg_confidence = confidence_total / total if total > 0 else 0
+        insights = self.rank_insight_terms(insight_state)
+
+        return details_file, sentiment_counts, insights, avg_confidence, insight_state
+
+    def review_hash(self, review):
+        """Get a stable identifier for a review from its text"""
+        return hashlib.sha1(str(review).encode('utf-8')).hexdigest()
+
+    def find_new_reviews(self, reviews, known_counts):
+        """Get the reviews not yet scored, counting repeated texts separately
+
+        Short texts like "Great product" repeat often, so a review only counts
+        as scored while the previous analysis still has an unmatched copy of it.
+        """
+        remaining = Counter(known_counts)
+        new_reviews = []
         for review in reviews:
-            try:
-                processed_review = self.preprocess_text(review)
-                vectorized = self.vectorizer.transform([processed_review])
-                
-                prediction = self.model.predict(vectorized)[0]
-                probabilities = self.model.predict_proba(vectorized)[0]
-                confidence = float(max(probabilities))
-                
-                sentiment_counts[prediction] += 1
-                
-                results.append({
-                    'review': review,
-                    'processed': processed_review,
-                    'sentiment': prediction,
-                    'confidence': confidence
-                })
-                
-            except Exception as e:
-                self.logger.error(f'Error analyzing review: {str(e)}')
+            review_hash = self.review_hash(review)
+            if remaining[review_hash] > 0:
+                remaining[review_hash] -= 1
+            else:
+                new_reviews.append(review)
+        return new_reviews
+
+    def load_previous_analysis(self, product_id):
+        """Load the latest saved analysis for a product, if any"""
+        files = sorted(glob.glob(f'{self.output_dir}analysis_{product_id}_*.json'))
+        if not files:
+            return None
+
+        try:
+            with open(files[-1], 'r') as f:
+                previous = json.load(f)
+            self.logger.info(f'Loaded previous analysis from {files[-1]}')
+            return previous
+        except Exception as e:
+            self.logger.error(f'Error loading previous analysis: {str(e)}')
+            return None
+
+    def iter_previous_results(self, previous):
+        """Yield the detail records of a saved analysis, streaming JSON Lines details"""
+        if 'detailed_analysis_file' in previous:
+            with open(previous['detailed_analysis_file'], 'r') as f:
+                results = (json.loads(line) for line in f if line.strip())
+                yield from self.with_review_hashes(results)
+        else:
+            yield from self.with_review_hashes(previous.get('detailed_analysis', []))
+
+    def with_review_hashes(self, results):
+        """Fill in review hashes missing from records saved by older versions"""
+        for result in results:
+            if 'review_hash' not in result:
+                result['review_hash'] = self.review_hash(result['review'])
+            yield result
+
+    def can_reuse_analysis(self, previous):
+        """Check a saved analysis has details and was scored by the loaded model"""
+        if not previous:
+            return False
+        if 'detailed_analysis_file' in previous:
+            if not os.path.exists(previous['detailed_analysis_file']):
+                return False
+        elif not previous.get('detailed_analysis'):
+            return False
+        if previous.get('model_training_date') != self.model_info.get('training_date'):
+            self.logger.info('Previous analysis used a different model, re-scoring all reviews')
+            return False
+        return True
+
+    def analyze_reviews_incremental(self, product_id, reviews, previous=None):
+        """Analyze only reviews not covered by the latest saved analysis"""
+        if previous is None:
+            previous = self.load_previous_analysis(product_id)
+        if not self.can_reuse_analysis(previous):
+            results, sentiment_counts, insights, insight_state = self.analyze_reviews(reviews)
+            return results, sentiment_counts, insights, None, insight_state
+
+        previous_results = list(self.iter_previous_results(previous))
+        known_counts = Counter(result['review_hash'] for result in previous_results)
+
+        new_reviews = self.find_new_reviews(reviews, known_counts)
+        self.logger.info(f'{len(new_reviews)} new reviews since last analysis ({len(previous_results)} already scored)')
+
+        previous_summary = previous['summary']
+        previous_total = sum(previous_summary['review_counts'].values())
+        previous_confidence = previous_summary['confidence_score']
+
+        insight_state = self.load_insight_state(previous)
+        if insight_state is None:
+            # Older analyses have no saved state, so rebuild it once from their stored text
+            insight_state = self.rebuild_insight_state(previous_results)
+
+        if not new_reviews:
+            return (previous_results, previous_summary['review_counts'],
+                    previous_summary.get('insights', {}), previous_confidence, insight_state)
+
+        scored = self.score_reviews(new_reviews)
+        if scored is None:
+            return (previous_results, previous_summary['review_counts'],
+                    previous_summary.get('insights', {}), previous_confidence, insight_state)
+        processed_reviews, vectorized, predictions, confidences = scored
+
+        new_results = list(self.build_results(new_reviews, processed_reviews, predictions, confidences))
+        new_counts = Counter(result['sentiment'] for result in new_results)
+
+        sentiment_counts = {
+            sentiment: previous_summary['review_counts'].get(sentiment, 0) + new_counts[sentiment]
+            for sentiment in ('positive', 'neutral', 'negative')
+        }
+        total = previous_total + len(new_results)
+        confidence = (previous_confidence * previous_total + sum(r['confidence'] for r in new_results)) / total if total > 0 else 0
+
+        results = previous_results + new_results
+
+        # Only the new batch is added to the saved per-class sums
+        insights, insight_state = self.extract_insights(vectorized, predictions, insight_state)
+
+        return results, sentiment_counts, insights, confidence, insight_state
+
+    def get_feature_importance(self, sentiment):
+        """Get a per-term weight for how strongly the model ties a term to a sentiment"""
+        model = self.model
+        classes = list(model.classes_)
+        if hasattr(model, 'calibrated_classifiers_'):
+            model = model.calibrated_classifiers_[0].estimator
+        if hasattr(model, 'feature_importances_'):
+            # Tree importances carry no direction, so the same weight serves every class
+            return np.asarray(model.feature_importances_)
+        if sentiment not in classes:
+            return np.zeros(len(self.vectorizer.get_feature_names_out()))
+        if hasattr(model, 'coef_'):
+            coef = np.asarray(model.coef_)
+            if coef.shape[0] == len(classes):
+                weight = coef[classes.index(sentiment)]
+            else:
+                # Binary models keep one row pointing towards the second class
+                weight = coef[0] if classes.index(sentiment) == 1 else -coef[0]
+            return np.clip(weight, 0, None)
+        if hasattr(model, 'feature_log_prob_'):
+            # How much more a term points to this class than to any other
+            log_prob = np.asarray(model.feature_log_prob_)
+            index = classes.index(sentiment)
+            others = np.delete(log_prob, index, axis=0)
+            if others.size == 0:
+                return np.ones(log_prob.shape[1])
+            return np.clip(log_prob[index] - others.max(axis=0), 0, None)
+        return np.ones(len(self.vectorizer.get_feature_names_out()))
+
+    def new_insight_state(self):
+        """Create empty per-class TF-IDF sums and class sizes for insight ranking"""
+        return {'class_sums': {}, 'class_sizes': {}}
+
+    def accumulate_class_sums(self, vectorized, predictions, insight_state):
+        """Add a batch's per-class TF-IDF column sums to running totals"""
+        class_sums = insight_state['class_sums']
+        class_sizes = insight_state['class_sizes']
+        for sentiment in ('positive', 'negative'):
+            mask = predictions == sentiment
+            if not mask.any():
                 continue
-        
-        return results, sentiment_counts
+            batch_sum = np.asarray(vectorized[mask].sum(axis=0)).ravel()
+            if sentiment in class_sums:
+                class_sums[sentiment] = class_sums[sentiment] + batch_sum
+            else:
+                class_sums[sentiment] = batch_sum
+            class_sizes[sentiment] = class_sizes.get(sentiment, 0) + int(mask.sum())
+
+    def rank_insight_terms(self, insight_state, top_n=5):
+        """Rank terms by class-conditional mean TF-IDF weighted by model importance"""
+        insights = {}
+        try:
+            if not hasattr(self, 'feature_names'):
+                self.feature_names = self.vectorizer.get_feature_names_out()
+                self.feature_importance = {
+                    sentiment: self.get_feature_importance(sentiment)
+                    for sentiment in ('positive', 'negative')
+                }
+
+            for sentiment in ('positive', 'negative'):
+                class_size = insight_state['class_sizes'].get(sentiment)
+                if not class_size:
+                    insights[sentiment] = []
+                    continue
+
+                class_mean = insight_state['class_sums'][sentiment] / class_size
+                scores = class_mean * self.feature_importance[sentiment]
+                top = np.argsort(scores)[::-1][:top_n]
+                insights[sentiment] = [
+                    {'term': self.feature_names[i], 'score': float(scores[i])}
+                    for i in top if scores[i] > 0
+                ]
+        except Exception as e:
+            self.logger.error(f'Error extracting insights: {str(e)}')
+
+        return insights
+
+    def extract_insights(self, vectorized, predictions, insight_state=None, top_n=5):
+        """Find the terms driving positive and negative reviews
+
+        The batch is added to insight_state (or a new state) so later runs can
+        extend the sums without revisiting earlier reviews.
+        """
+        if insight_state is None:
+            insight_state = self.new_insight_state()
+        try:
+            self.accumulate_class_sums(vectorized, predictions, insight_state)
+        except Exception as e:
+            self.logger.error(f'Error extracting insights: {str(e)}')
+            return {}, insight_state
+
+        return self.rank_insight_terms(insight_state, top_n), insight_state
+
+    def rebuild_insight_state(self, results, chunk_size=1000):
+        """Rebuild insight sums from stored detail records, a chunk at a time"""
+        insight_state = self.new_insight_state()
+        results = iter(results)
+        try:
+            while True:
+                chunk = list(itertools.islice(results, chunk_size))
+                if not chunk:
+                    break
+                processed = [r['processed'] if 'processed' in r else self.preprocess_text(r['review']) for r in chunk]
+                vectorized = self.vectorizer.transform(processed)
+                predictions = np.array([r['sentiment'] for r in chunk])
+                self.accumulate_class_sums(vectorized, predictions, insight_state)
+        except Exception as e:
+            self.logger.error(f'Error rebuilding insights: {str(e)}')
+        return insight_state
+
+    def save_insight_state(self, path, insight_state):
+        """Save per-class insight sums next to an analysis"""
+        arrays = {}
+        for sentiment, class_sum in insight_state['class_sums'].items():
+            arrays[f'sum_{sentiment}'] = class_sum
+            arrays[f'size_{sentiment}'] = np.array(insight_state['class_sizes'][sentiment])
+        np.savez_compressed(path, **arrays)
+
+    def load_insight_state(self, previous):
+        """Load the insight sums saved with a previous analysis, if any"""
+        path = previous.get('insight_state_file')
+        if not path or not os.path.exists(path):
+            return None
+
+        try:
+            insight_state = self.new_insight_state()
+            with np.load(path) as arrays:
+                for key in arrays.files:
+                    if key.startswith('sum_'):
+                        sentiment = key[len('sum_'):]
+                        insight_state['class_sums'][sentiment] = arrays[key]
+                        insight_state['class_sizes'][sentiment] = int(arrays[f'size_{sentiment}'])
+            return insight_state
+        except Exception as e:
+            self.logger.error(f'Error loading insight state: {str(e)}')
+            return None
 
     def generate_recommendation(self, sentiment_counts, confidence):
         """Generate a recommendation based on analysis"""
@@ -225,80 +586,163 @@ class ProductAnalyzer:
         else:
             return "Exercise caution - significant number of negative reviews."
 
-    def save_results(self, product_id, analysis_results, sentiment_counts):
+    def build_output(self, product_id, sentiment_counts, avg_confidence, insights=None):
+        """Build the summary document shared by the saved analysis formats"""
+        summary = {
+            'overall_sentiment': max(sentiment_counts.items(), key=lambda x: x[1])[0] if any(sentiment_counts.values()) else "neutral",
+            'confidence_score': avg_confidence,
+            'review_counts': sentiment_counts,
+            'recommendation': self.generate_recommendation(sentiment_counts, avg_confidence),
+            'insights': insights or {}
+        }
+
+        product_info = self.get_product_info(product_id)
+        product_info['id'] = product_id
+        product_info['url'] = f'https://www.amazon.com/dp/{product_id}'
+
+        return {
+            'product_id': product_id,
+            'product_info': product_info,
+            'timestamp': datetime.now().isoformat(),
+            'model_training_date': self.model_info.get('training_date'),
+            'summary': summary
+        }
+
+    def output_token(self):
+        """Get a unique, time-ordered suffix for files written to the output directory
+
+        Names sort by time like the old per-second timestamps, but refreshes
+        within the same second no longer overwrite the files they read from.
+        """
+        return f'{datetime.now().strftime("%Y%m%d_%H%M%S_%f")}_{uuid.uuid4().hex[:8]}'
+
+    def write_output(self, product_id, output, insight_state=None):
+        """Write an analysis document to the output directory"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        timestamp = self.output_token()
+        if insight_state is not None:
+            state_file = f'{self.output_dir}insights_{product_id}_{timestamp}.npz'
+            self.save_insight_state(state_file, insight_state)
+            output['insight_state_file'] = state_file
+
+        filename = f'{self.output_dir}analysis_{product_id}_{timestamp}.json'
+        with open(filename, 'w') as f:
+            json.dump(output, f, indent=2)
+
+        return filename
+
+    def save_results(self, product_id, analysis_results, sentiment_counts, insights=None, avg_confidence=None,
+                     insight_state=None):
         """Save analysis results"""
         try:
             if not analysis_results:
                 raise ValueError("NO_REVIEWS_FOUND")
 
-            total_reviews = len(analysis_results)
-            avg_confidence = sum(r['confidence'] for r in analysis_results) / total_reviews if total_reviews > 0 else 0
-            
-            summary = {
-                'overall_sentiment': max(sentiment_counts.items(), key=lambda x: x[1])[0] if any(sentiment_counts.values()) else "neutral",
-                'confidence_score': avg_confidence,
-                'review_counts': sentiment_counts,
-                'recommendation': self.generate_recommendation(sentiment_counts, avg_confidence)
-            }
+            if avg_confidence is None:
+                total_reviews = len(analysis_results)
+                avg_confidence = sum(r['confidence'] for r in analysis_results) / total_reviews if total_reviews > 0 else 0
 
-            product_info = self.get_product_info(product_id)
-            product_info['id'] = product_id
-            product_info['url'] = f'https://www.amazon.com/dp/{product_id}'
+            output = self.build_output(product_id, sentiment_counts, avg_confidence, insights)
+            output['detailed_analysis'] = analysis_results
 
-            output = {
-                'product_id': product_id,
-                'product_info': product_info,
-                'timestamp': datetime.now().isoformat(),
-                'summary': summary,
-                'detailed_analysis': analysis_results
-            }
+            return self.write_output(product_id, output, insight_state)
 
-            os.makedirs('bot_data', exist_ok=True)
-            filename = f'bot_data/analysis_{product_id}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-            with open(filename, 'w') as f:
-                json.dump(output, f, indent=2)
+        except Exception as e:
+            self.logger.error(f'Error saving results: {str(e)}')
+            raise
 
-            return filename
+    def save_streamed_results(self, product_id, details_file, sentiment_counts, insights, avg_confidence,
+                              insight_state=None):
+        """Save the summary of a streamed analysis, pointing at its JSON Lines details"""
+        try:
+            if not any(sentiment_counts.values()):
+                raise ValueError("NO_REVIEWS_FOUND")
+
+            output = self.build_output(product_id, sentiment_counts, avg_confidence, insights)
+            output['detailed_analysis_file'] = details_file
+
+            return self.write_output(product_id, output, insight_state)
 
         except Exception as e:
             self.logger.error(f'Error saving results: {str(e)}')
             raise
 
-def main(product_id):
-    try:
-        analyzer = ProductAnalyzer()
-        
+    def analyze_product(self, product_id, incremental=False, stream=False, chunk_size=1000):
+        """Run the full analysis for a product and return the saved results file"""
         # Get reviews for the product
-        reviews = analyzer.get_product_reviews(product_id)
-        
+        reviews = self.get_product_reviews(product_id)
+
         # Log more details about the search
-        analyzer.logger.info(f'Product ID: {product_id}')
-        analyzer.logger.info(f'Found {len(reviews)} reviews')
-        
+        self.logger.info(f'Product ID: {product_id}')
+        self.logger.info(f'Found {len(reviews)} reviews')
+
         if not reviews:
-            print("NO_PRODUCT_IN_DATASET")
-            analyzer.logger.warning(f'No reviews found in dataset for product {product_id}')
-            sys.exit(1)
-        
+            self.logger.warning(f'No reviews found in dataset for product {product_id}')
+            raise ValueError("NO_PRODUCT_IN_DATASET")
+
+        previous = None
+        if incremental:
+            previous = self.load_previous_analysis(product_id)
+            # Products analyzed with streaming stay streamed on incremental refreshes
+            if previous and 'detailed_analysis_file' in previous:
+                stream = True
+
+        # Stream large review sets to disk instead of holding every result in memory
+        if stream:
+            reusable = previous if self.can_reuse_analysis(previous) else None
+            details_file, sentiment_counts, insights, avg_confidence, insight_state = self.analyze_reviews_streaming(
+                product_id, reviews, chunk_size, reusable
+            )
+            if not any(sentiment_counts.values()):
+                self.logger.warning('Analysis produced no results')
+                raise ValueError("NO_REVIEWS_FOUND")
+
+            return self.save_streamed_results(product_id, details_file, sentiment_counts, insights, avg_confidence,
+                                              insight_state)
+
         # Analyze reviews
-        analysis_results, sentiment_counts = analyzer.analyze_reviews(reviews)
-        
+        avg_confidence = None
+        if incremental:
+            analysis_results, sentiment_counts, insights, avg_confidence, insight_state = self.analyze_reviews_incremental(
+                product_id, reviews, previous
+            )
+        else:
+            analysis_results, sentiment_counts, insights, insight_state = self.analyze_reviews(reviews)
+
         if not analysis_results:
-            print("NO_REVIEWS_FOUND")
-            analyzer.logger.warning('Analysis produced no results')
-            sys.exit(1)
-        
+            self.logger.warning('Analysis produced no results')
+            raise ValueError("NO_REVIEWS_FOUND")
+
         # Save and return results
-        results_file = analyzer.save_results(product_id, analysis_results, sentiment_counts)
+        return self.save_results(product_id, analysis_results, sentiment_counts, insights, avg_confidence,
+                                 insight_state)
+
+ANALYSIS_ERRORS = ("NO_PRODUCT_IN_DATASET", "NO_REVIEWS_FOUND")
+
+def main(product_id, incremental=False, stream=False, chunk_size=1000):
+    try:
+        analyzer = ProductAnalyzer()
+        results_file = analyzer.analyze_product(product_id, incremental, stream, chunk_size)
         print(results_file)
         
+    except ValueError as e:
+        if str(e) in ANALYSIS_ERRORS:
+            print(str(e))
+        logging.getLogger(__name__).error(f"Error in main execution: {str(e)}")
+        sys.exit(1)
     except Exception as e:
-        logging.error(f"Error in main execution: {str(e)}")
+        logging.getLogger(__name__).error(f"Error in main execution: {str(e)}")
         sys.exit(1)
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python analyze_product.py <product_id>", file=sys.stderr)
-        sys.exit(1)
-    
-    main(sys.argv[1])
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Analyze the reviews of a product')
+    parser.add_argument('product_id')
+    parser.add_argument('--incremental', action='store_true',
+                        help='only score reviews not in the latest saved analysis')
+    parser.add_argument('--stream', action='store_true',
+                        help='score in chunks and stream details to a JSON Lines file')
+    parser.add_argument('--chunk-size', type=int, default=1000,
+                        help='reviews per chunk when streaming')
+    args = parser.parse_args()
+
+    main(args.product_id, args.incremental, args.stream, args.chunk_size)
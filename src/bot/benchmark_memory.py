@@ -0,0 +1,73 @@
+import argparse
+import tempfile
+import tracemalloc
+
+from analyze_product import ProductAnalyzer
+
+
+def measure_peak(func, *args):
+    """Run a function and return its result and peak traced memory in MB"""
+    tracemalloc.start()
+    try:
+        result = func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak / (1024 * 1024)
+
+
+def benchmark_memory(analyzer, product_id, reviews, chunk_size=1000):
+    """Compare peak memory of the in-memory and streaming analysis pipelines"""
+    def in_memory():
+        results, sentiment_counts, insights, insight_state = analyzer.analyze_reviews(reviews)
+        return analyzer.save_results(product_id, results, sentiment_counts, insights, insight_state=insight_state)
+
+    def streaming():
+        details_file, sentiment_counts, insights, avg_confidence, insight_state = analyzer.analyze_reviews_streaming(
+            product_id, reviews, chunk_size
+        )
+        return analyzer.save_streamed_results(
+            product_id, details_file, sentiment_counts, insights, avg_confidence, insight_state
+        )
+
+    report = {'reviews': len(reviews), 'chunk_size': chunk_size}
+    output_dir = analyzer.output_dir
+    try:
+        for name, pipeline in (('in_memory', in_memory), ('streaming', streaming)):
+            # Benchmark output goes to a throwaway directory so it never touches real analyses
+            with tempfile.TemporaryDirectory() as scratch_dir:
+                analyzer.output_dir = f'{scratch_dir}/'
+                _, peak_mb = measure_peak(pipeline)
+            report[f'{name}_peak_mb'] = round(peak_mb, 2)
+    finally:
+        analyzer.output_dir = output_dir
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark analysis memory usage')
+    parser.add_argument('product_id')
+    parser.add_argument('--reviews', type=int, default=50000,
+                        help='number of reviews to analyze, repeating the product reviews as needed')
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    analyzer = ProductAnalyzer()
+    reviews = analyzer.get_product_reviews(args.product_id)
+    if not reviews:
+        print("NO_PRODUCT_IN_DATASET")
+        return
+
+    reviews = (reviews * (args.reviews // len(reviews) + 1))[:args.reviews]
+    report = benchmark_memory(analyzer, args.product_id, reviews, args.chunk_size)
+
+    print("\nMemory Benchmark:")
+    print("-" * 50)
+    print(f"Reviews analyzed: {report['reviews']} (chunk size {report['chunk_size']})")
+    print(f"In-memory peak: {report['in_memory_peak_mb']:.2f} MB")
+    print(f"Streaming peak: {report['streaming_peak_mb']:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
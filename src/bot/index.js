@@ -98,6 +98,7 @@ class ProductAnalyzer {
       const pythonProcess = spawn("python3", [
         "src/bot/analyze_product.py",
         productId,
+        "--incremental",
       ]);
       let result = "";
       let error = "";
@@ -220,6 +221,21 @@ class ProductAnalyzer {
       insights.push("ℹ️ Many reviewers have mixed feelings");
     }
 
+    const terms = summary.insights || {};
+    const formatTerms = (entries) =>
+      entries
+        .slice(0, 3)
+        .map((entry) => entry.term)
+        .join(", ");
+
+    if (terms.positive && terms.positive.length > 0) {
+      insights.push(`👍 Praised for: ${formatTerms(terms.positive)}`);
+    }
+
+    if (terms.negative && terms.negative.length > 0) {
+      insights.push(`👎 Complaints about: ${formatTerms(terms.negative)}`);
+    }
+
     return insights.join("\n");
   }
 }
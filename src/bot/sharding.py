@@ -0,0 +1,250 @@
+import glob
+import itertools
+import json
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import zlib
+
+import pandas as pd
+
+from analyze_product import ANALYSIS_ERRORS, ProductAnalyzer
+
+# Methods a shard worker will run on behalf of the router
+SHARD_METHODS = ('get_product_reviews', 'get_product_info', 'analyze_product')
+
+
+def shard_for(product_id, num_shards):
+    """Get the shard owning a product, stable across processes and machines"""
+    return zlib.crc32(str(product_id).strip().encode('utf-8')) % num_shards
+
+
+def shard_path(shard_dir, shard):
+    return os.path.join(shard_dir, f'shard_{shard}.csv')
+
+
+def manifest_path(shard_dir):
+    return os.path.join(shard_dir, 'manifest.json')
+
+
+def build_manifest(dataset_path, num_shards):
+    """Describe the shard layout and the dataset version it was built from"""
+    stat = os.stat(dataset_path)
+    return {
+        'num_shards': num_shards,
+        'dataset_path': os.path.abspath(dataset_path),
+        'dataset_size': stat.st_size,
+        'dataset_mtime': stat.st_mtime
+    }
+
+
+def shards_are_current(dataset_path, shard_dir, num_shards):
+    """Check the shards on disk match the shard count and the current dataset"""
+    try:
+        with open(manifest_path(shard_dir), 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    if manifest != build_manifest(dataset_path, num_shards):
+        return False
+    return all(os.path.exists(shard_path(shard_dir, shard)) for shard in range(num_shards))
+
+
+def write_shards(dataset_path, shard_dir, num_shards, chunksize=10000):
+    """Split the review dataset into one CSV per shard by ASIN hash
+
+    Rows listing several ASINs are copied to every shard owning one of them.
+    The dataset is read in chunks so splitting never holds the whole corpus.
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+
+    # Drop the old layout first so no stale shard or manifest survives a failed rebuild
+    for path in glob.glob(os.path.join(shard_dir, 'shard_*.csv')) + [manifest_path(shard_dir)]:
+        if os.path.exists(path):
+            os.remove(path)
+
+    paths = [shard_path(shard_dir, shard) for shard in range(num_shards)]
+    written = [False] * num_shards
+
+    for chunk in pd.read_csv(dataset_path, chunksize=chunksize):
+        owners = chunk['asins'].astype(str).map(
+            lambda asins: {shard_for(asin, num_shards) for asin in asins.split(',') if asin.strip()}
+        )
+        for shard in range(num_shards):
+            rows = chunk[owners.map(lambda shards: shard in shards)]
+            # Always write once so every shard file exists with a header
+            if rows.empty and written[shard]:
+                continue
+            rows.to_csv(paths[shard], mode='a' if written[shard] else 'w',
+                        header=not written[shard], index=False)
+            written[shard] = True
+
+    # Written last, so the manifest only exists for a complete set of shards
+    with open(manifest_path(shard_dir), 'w') as f:
+        json.dump(build_manifest(dataset_path, num_shards), f, indent=2)
+
+    logging.info(f'Wrote {num_shards} review shards to {shard_dir}')
+    return paths
+
+
+def shard_worker(dataset_path, model_dir, connection):
+    """Serve requests for one shard until a None request arrives"""
+    try:
+        analyzer = ProductAnalyzer(model_dir, dataset_path)
+        startup_error = None
+    except Exception as e:
+        # Keep answering so the router reports the failure instead of waiting forever
+        startup_error = f'Shard {dataset_path} failed to start: {str(e)}'
+
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+
+        request_id, method, args = request
+        try:
+            if startup_error:
+                raise RuntimeError(startup_error)
+            if method not in SHARD_METHODS:
+                raise ValueError(f'Unsupported shard method: {method}')
+            connection.send((request_id, True, getattr(analyzer, method)(*args)))
+        except Exception as e:
+            connection.send((request_id, False, str(e)))
+
+
+class ShardRouter:
+    """Route product requests to the worker process owning each ASIN
+
+    Each worker has its own pipe, so a worker that dies cannot block the
+    replies of the others.
+    """
+
+    def __init__(self, shard_dir, num_shards, model_dir='model/', poll_interval=1.0):
+        self.num_shards = num_shards
+        self.poll_interval = poll_interval
+        self.request_ids = itertools.count()
+        self.request_shards = {}
+        self.failed = {}
+        self.closed = set()
+        self.connections = []
+        self.workers = []
+
+        for shard in range(num_shards):
+            connection, worker_connection = multiprocessing.Pipe()
+            worker = multiprocessing.Process(
+                target=shard_worker,
+                args=(shard_path(shard_dir, shard), model_dir, worker_connection),
+                daemon=True
+            )
+            worker.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self.workers.append(worker)
+
+    def worker_error(self, shard):
+        return f'Shard {shard} worker exited with code {self.workers[shard].exitcode}'
+
+    def submit(self, product_id, method, *args):
+        """Send a request to the owning shard and return its request ID"""
+        request_id = next(self.request_ids)
+        shard = shard_for(product_id, self.num_shards)
+        self.request_shards[request_id] = shard
+        try:
+            self.connections[shard].send((request_id, method, (product_id,) + args))
+        except (OSError, EOFError):
+            self.failed[request_id] = self.worker_error(shard)
+        return request_id
+
+    def gather(self, request_ids):
+        """Wait for the responses to a set of requests
+
+        Requests owed by a worker that has died are answered with an error
+        instead of waiting for a reply that will never come.
+        """
+        pending = set(request_ids)
+        results = {}
+        for request_id in list(pending):
+            if request_id in self.failed:
+                pending.discard(request_id)
+                results[request_id] = (False, self.failed.pop(request_id))
+
+        while pending:
+            shards = {self.request_shards[request_id] for request_id in pending} - self.closed
+            ready = multiprocessing.connection.wait(
+                [self.connections[shard] for shard in shards], timeout=self.poll_interval
+            )
+
+            for connection in ready:
+                shard = self.connections.index(connection)
+                try:
+                    request_id, ok, value = connection.recv()
+                except (OSError, EOFError):
+                    # The worker closed its end, so nothing more will arrive from it
+                    self.closed.add(shard)
+                    self.workers[shard].join(self.poll_interval)
+                    continue
+                if request_id in pending:
+                    pending.discard(request_id)
+                    results[request_id] = (ok, value)
+
+            for request_id in list(pending):
+                shard = self.request_shards[request_id]
+                if shard in self.closed or not (self.workers[shard].is_alive() or self.connections[shard].poll()):
+                    pending.discard(request_id)
+                    results[request_id] = (False, self.worker_error(shard))
+
+        for request_id in results:
+            self.request_shards.pop(request_id, None)
+        return results
+
+    def call(self, product_id, method, *args):
+        ok, value = self.gather([self.submit(product_id, method, *args)]).popitem()[1]
+        if not ok:
+            if value in ANALYSIS_ERRORS:
+                raise ValueError(value)
+            raise RuntimeError(value)
+        return value
+
+    def get_product_reviews(self, product_id):
+        return self.call(product_id, 'get_product_reviews')
+
+    def get_product_info(self, product_id):
+        return self.call(product_id, 'get_product_info')
+
+    def analyze_product(self, product_id, incremental=False, stream=False, chunk_size=1000):
+        return self.call(product_id, 'analyze_product', incremental, stream, chunk_size)
+
+    def compare_products(self, product_ids, incremental=False, stream=False, chunk_size=1000):
+        """Analyze several products in parallel across their shards
+
+        Returns a mapping of product ID to its results file, or to the error
+        message if that product could not be analyzed.
+        """
+        request_ids = {
+            product_id: self.submit(product_id, 'analyze_product', incremental, stream, chunk_size)
+            for product_id in product_ids
+        }
+        responses = self.gather(request_ids.values())
+        return {product_id: responses[request_id][1] for product_id, request_id in request_ids.items()}
+
+    def close(self):
+        for connection, worker in zip(self.connections, self.workers):
+            if worker.is_alive():
+                try:
+                    connection.send(None)
+                except (OSError, EOFError):
+                    pass
+        for connection, worker in zip(self.connections, self.workers):
+            worker.join()
+            connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
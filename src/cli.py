@@ -0,0 +1,299 @@
+import argparse
+import json
+import os
+import pickle
+import sys
+
+import pandas as pd
+
+# The bot, training and validation code live in plain script directories
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+for subdir in ('bot', 'training', 'validation'):
+    sys.path.insert(0, os.path.join(SRC_DIR, subdir))
+
+DEFAULT_CONFIG = {
+    'data_path': 'dataset/Datafiniti_Amazon_Consumer_Reviews_of_Amazon_Products.csv',
+    'model_dir': 'model/',
+    'model_families': ['random_forest', 'logistic_regression', 'linear_svm', 'complement_nb'],
+    'latency_weight': 0.0001,
+    'chunk_size': 1000,
+    'num_shards': 0,
+    'shard_dir': 'dataset/shards/'
+}
+
+
+def load_config(path=None):
+    """Load the pipeline configuration, overriding defaults from a JSON file"""
+    config = dict(DEFAULT_CONFIG)
+    if path:
+        with open(path, 'r') as f:
+            config.update(json.load(f))
+    return config
+
+
+class PipelineState:
+    """Dataset and model components shared by every command in one process"""
+
+    def __init__(self, config):
+        self.config = config
+        self.reviews_df = None
+        self.model = None
+        self.vectorizer = None
+        self.model_info = None
+        self.product_analyzer = None
+        self.router = None
+
+    def load_reviews(self):
+        """Read the review dataset once"""
+        if self.reviews_df is None:
+            self.reviews_df = pd.read_csv(self.config['data_path'])
+        return self.reviews_df
+
+    def load_model(self):
+        """Load the saved model components unless they are already in memory"""
+        if self.model is None:
+            model_dir = self.config['model_dir']
+            with open(f'{model_dir}sentiment_model.pkl', 'rb') as f:
+                self.model = pickle.load(f)
+            with open(f'{model_dir}vectorizer.pkl', 'rb') as f:
+                self.vectorizer = pickle.load(f)
+            with open(f'{model_dir}metadata/model_info.json', 'r') as f:
+                self.model_info = json.load(f)
+        return self.model, self.vectorizer, self.model_info
+
+    def train(self):
+        """Train a model and keep the winner in memory for the next stages"""
+        from review_analyzer import ReviewAnalyzer
+
+        analyzer = ReviewAnalyzer(
+            data_path=self.config['data_path'],
+            model_families=self.config['model_families'],
+            latency_weight=self.config['latency_weight'],
+            model_dir=self.config['model_dir']
+        )
+        analyzer.load_and_prepare_data(self.load_reviews())
+        analyzer.train_model()
+        analyzer.validate_model()
+
+        self.model = analyzer.model.best_estimator_
+        self.vectorizer = analyzer.vectorizer
+        self.model_info = analyzer.metadata
+        self.product_analyzer = None
+        return analyzer
+
+    def validate(self):
+        """Run the validation suite against the in-memory model"""
+        from model_validator import ModelValidator, run_validation
+
+        model, vectorizer, model_info = self.load_model()
+        validator = ModelValidator(self.config['model_dir'], model, vectorizer, model_info)
+        return run_validation(validator)
+
+    def get_product_analyzer(self):
+        """Build the product analyzer once from the shared components"""
+        if self.product_analyzer is None:
+            from analyze_product import ProductAnalyzer
+
+            model, vectorizer, model_info = self.load_model()
+            self.product_analyzer = ProductAnalyzer(
+                self.config['model_dir'],
+                self.config['data_path'],
+                model=model,
+                vectorizer=vectorizer,
+                model_info=model_info,
+                reviews_df=self.load_reviews()
+            )
+        return self.product_analyzer
+
+    def get_router(self):
+        """Start one worker per review shard, splitting the dataset first if needed"""
+        if self.router is None:
+            from sharding import ShardRouter, shards_are_current, write_shards
+
+            num_shards = self.config['num_shards']
+            if not shards_are_current(self.config['data_path'], self.config['shard_dir'], num_shards):
+                write_shards(self.config['data_path'], self.config['shard_dir'], num_shards)
+            self.router = ShardRouter(self.config['shard_dir'], num_shards, self.config['model_dir'])
+        return self.router
+
+    def get_analyzer(self):
+        """Get the sharded router or the in-process analyzer, depending on config"""
+        if self.config['num_shards'] > 0:
+            return self.get_router()
+        return self.get_product_analyzer()
+
+    def analyze(self, product_id, incremental=False, stream=False):
+        """Analyze one product and return the saved results file"""
+        analyzer = self.get_analyzer()
+        return analyzer.analyze_product(product_id, incremental, stream, self.config['chunk_size'])
+
+    def compare(self, product_ids, incremental=False):
+        """Analyze several products, scattering them across shards when sharded"""
+        if self.config['num_shards'] > 0:
+            return self.get_router().compare_products(product_ids, incremental, False, self.config['chunk_size'])
+
+        from analyze_product import ANALYSIS_ERRORS
+
+        results = {}
+        for product_id in product_ids:
+            try:
+                results[product_id] = self.analyze(product_id, incremental)
+            except ValueError as e:
+                if str(e) not in ANALYSIS_ERRORS:
+                    raise
+                results[product_id] = str(e)
+        return results
+
+    def close(self):
+        if self.router is not None:
+            self.router.close()
+            self.router = None
+
+
+def run_analysis(state, product_id, incremental=False, stream=False):
+    """Analyze a product, printing the results file or the analysis error code"""
+    from analyze_product import ANALYSIS_ERRORS
+
+    try:
+        print(state.analyze(product_id, incremental, stream), flush=True)
+        return True
+    except ValueError as e:
+        if str(e) not in ANALYSIS_ERRORS:
+            raise
+        print(str(e), flush=True)
+        return False
+
+
+def command_train(state, args):
+    state.train()
+    if not args.skip_validation:
+        state.validate()
+    for product_id in args.precompute:
+        run_analysis(state, product_id)
+    return 0
+
+
+def command_validate(state, args):
+    state.validate()
+    return 0
+
+
+def command_analyze(state, args):
+    return 0 if run_analysis(state, args.product_id, args.incremental, args.stream) else 1
+
+
+def command_compare(state, args):
+    for product_id, result in state.compare(args.product_ids, args.incremental).items():
+        print(f'{product_id} {result}')
+    return 0
+
+
+def command_serve(state, args):
+    """Answer product IDs read from stdin with the loaded model kept warm
+
+    Each line holds one product ID, or several to compare in parallel; one
+    output line is printed per product.
+    """
+    state.get_analyzer()
+    for line in sys.stdin:
+        product_ids = line.split()
+        if not product_ids:
+            continue
+        try:
+            if len(product_ids) == 1:
+                run_analysis(state, product_ids[0], incremental=True)
+            else:
+                for product_id, result in state.compare(product_ids, incremental=True).items():
+                    print(f'{product_id} {result}', flush=True)
+        except Exception as e:
+            print(f'ERROR {str(e)}', flush=True)
+    return 0
+
+
+def command_shard(state, args):
+    from sharding import write_shards
+
+    if state.config['num_shards'] < 1:
+        print("Set the number of shards with --shards N", file=sys.stderr)
+        return 1
+    write_shards(state.config['data_path'], state.config['shard_dir'], state.config['num_shards'])
+    return 0
+
+
+def command_bench(state, args):
+    from benchmark_memory import benchmark_memory
+
+    analyzer = state.get_product_analyzer()
+    reviews = analyzer.get_product_reviews(args.product_id)
+    if not reviews:
+        print("NO_PRODUCT_IN_DATASET")
+        return 1
+
+    reviews = (reviews * (args.reviews // len(reviews) + 1))[:args.reviews]
+    report = benchmark_memory(analyzer, args.product_id, reviews, state.config['chunk_size'])
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Amazio review analysis pipeline')
+    parser.add_argument('--config', help='JSON file overriding the default configuration')
+    parser.add_argument('--chunk-size', type=int, help='reviews per chunk when streaming')
+    parser.add_argument('--shards', type=int,
+                        help='split reviews by ASIN hash across this many worker processes')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    train = subparsers.add_parser('train', help='train, validate and optionally precompute analyses')
+    train.add_argument('--skip-validation', action='store_true')
+    train.add_argument('--precompute', nargs='*', default=[], metavar='PRODUCT_ID',
+                       help='products to analyze with the freshly trained model')
+    train.set_defaults(func=command_train)
+
+    validate = subparsers.add_parser('validate', help='run the validation suite')
+    validate.set_defaults(func=command_validate)
+
+    analyze = subparsers.add_parser('analyze', help='analyze the reviews of a product')
+    analyze.add_argument('product_id')
+    analyze.add_argument('--incremental', action='store_true',
+                         help='only score reviews not in the latest saved analysis')
+    analyze.add_argument('--stream', action='store_true',
+                         help='score in chunks and stream details to a JSON Lines file')
+    analyze.set_defaults(func=command_analyze)
+
+    compare = subparsers.add_parser('compare', help='analyze several products in parallel')
+    compare.add_argument('product_ids', nargs='+')
+    compare.add_argument('--incremental', action='store_true',
+                         help='only score reviews not in the latest saved analysis')
+    compare.set_defaults(func=command_compare)
+
+    shard = subparsers.add_parser('shard', help='split the review dataset into ASIN shards')
+    shard.set_defaults(func=command_shard)
+
+    serve = subparsers.add_parser('serve', help='analyze product IDs read from stdin')
+    serve.set_defaults(func=command_serve)
+
+    bench = subparsers.add_parser('bench', help='compare analysis memory usage')
+    bench.add_argument('product_id')
+    bench.add_argument('--reviews', type=int, default=50000)
+    bench.set_defaults(func=command_bench)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    config = load_config(args.config)
+    if args.chunk_size:
+        config['chunk_size'] = args.chunk_size
+    if args.shards is not None:
+        config['num_shards'] = args.shards
+
+    state = PipelineState(config)
+    try:
+        return args.func(state, args)
+    finally:
+        state.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
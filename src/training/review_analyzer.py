@@ -4,6 +4,10 @@ import numpy as np
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.svm import LinearSVC
+from sklearn.naive_bayes import ComplementNB
+from sklearn.calibration import CalibratedClassifierCV
 from sklearn.metrics import classification_report, confusion_matrix
 import nltk
 from nltk.corpus import stopwords
@@ -13,23 +17,26 @@ import json
 import os
 from datetime import datetime
 import logging
+import time
 from sklearn.model_selection import GridSearchCV
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('model/training.log'),
-        logging.StreamHandler()
-    ]
-)
-
 class ReviewAnalyzer:
-    def __init__(self, data_path='dataset/Datafiniti_Amazon_Consumer_Reviews_of_Amazon_Products.csv'):
-        """Initialize the Review Analyzer with data path and create necessary directories"""
+    def __init__(self, data_path='dataset/Datafiniti_Amazon_Consumer_Reviews_of_Amazon_Products.csv',
+                 model_families=('random_forest', 'logistic_regression', 'linear_svm', 'complement_nb'),
+                 latency_weight=0.0001, model_dir='model/'):
+        """Initialize the Review Analyzer with data path and create necessary directories
+
+        model_families selects the estimator families evaluated during training and
+        latency_weight is the accuracy given up per millisecond of inference per
+        1,000 reviews when picking the winner. Artifacts, metadata, validation
+        results and the training log are written under model_dir.
+        """
         self.data_path = data_path
-        self.directories = ['model', 'model/validation', 'model/metadata', 'bot_data']
+        self.model_dir = model_dir
+        self.model_families = list(model_families)
+        self.latency_weight = latency_weight
+        self.directories = [model_dir, f'{model_dir}validation', f'{model_dir}metadata', 'bot_data']
+        self.setup_logging()
         self.create_directories()
         self.setup_nltk()
         
@@ -37,7 +44,26 @@ class ReviewAnalyzer:
         """Create necessary directories for model artifacts"""
         for directory in self.directories:
             os.makedirs(directory, exist_ok=True)
-            logging.info(f'Created directory: {directory}')
+            self.logger.info(f'Created directory: {directory}')
+
+    def setup_logging(self):
+        """Send this module's log records to the training log and the console
+
+        Handlers go on the module logger rather than the root logger, so the
+        analyzer keeps its own log when both run in one process.
+        """
+        os.makedirs(self.model_dir, exist_ok=True)
+        self.logger = logging.getLogger(__name__)
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+            handler.close()
+
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        for handler in (logging.FileHandler(f'{self.model_dir}training.log'), logging.StreamHandler()):
+            handler.setFormatter(formatter)
+            self.logger.addHandler(handler)
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
 
     def setup_nltk(self):
         """Download required NLTK data"""
@@ -45,17 +71,17 @@ class ReviewAnalyzer:
             nltk.download('punkt')
             nltk.download('stopwords')
             self.stop_words = set(stopwords.words('english'))
-            logging.info('NLTK setup completed successfully')
+            self.logger.info('NLTK setup completed successfully')
         except Exception as e:
-            logging.error(f'Error setting up NLTK: {str(e)}')
+            self.logger.error(f'Error setting up NLTK: {str(e)}')
             raise
 
-    def load_and_prepare_data(self):
-        """Load and prepare the dataset"""
-        logging.info('Loading dataset...')
+    def load_and_prepare_data(self, df=None):
+        """Load and prepare the dataset, reusing an already loaded DataFrame if given"""
+        self.logger.info('Loading dataset...')
         try:
-            self.df = pd.read_csv(self.data_path)
-            logging.info(f'Dataset loaded with {len(self.df)} rows')
+            self.df = pd.read_csv(self.data_path) if df is None else df
+            self.logger.info(f'Dataset loaded with {len(self.df)} rows')
             
             # Create sentiment labels
             self.df['sentiment'] = self.df['reviews.rating'].apply(self.assign_sentiment)
@@ -63,9 +89,9 @@ class ReviewAnalyzer:
             # Preprocess reviews
             self.df['processed_review'] = self.df['reviews.text'].apply(self.preprocess_text)
             
-            logging.info('Data preparation completed successfully')
+            self.logger.info('Data preparation completed successfully')
         except Exception as e:
-            logging.error(f'Error in data preparation: {str(e)}')
+            self.logger.error(f'Error in data preparation: {str(e)}')
             raise
 
     def assign_sentiment(self, rating):
@@ -88,12 +114,59 @@ class ReviewAnalyzer:
             words = [word for word in words if word.isalpha() and word not in self.stop_words]
             return ' '.join(words)
         except Exception as e:
-            logging.error(f'Error in text preprocessing: {str(e)}')
+            self.logger.error(f'Error in text preprocessing: {str(e)}')
             return ""
 
+    def get_candidate_models(self):
+        """Define the estimator families and hyperparameter grids to evaluate"""
+        candidates = {
+            'random_forest': (
+                RandomForestClassifier(random_state=42),
+                {
+                    'n_estimators': [100, 200],
+                    'max_depth': [10, 20, None],
+                    'min_samples_split': [2, 5],
+                    'min_samples_leaf': [1, 2]
+                }
+            ),
+            'logistic_regression': (
+                LogisticRegression(max_iter=1000),
+                {'C': [0.1, 1, 10]}
+            ),
+            'linear_svm': (
+                # A single calibrated LinearSVC keeps inference to one sparse dot product
+                CalibratedClassifierCV(LinearSVC(random_state=42), ensemble=False),
+                {'estimator__C': [0.1, 1, 10]}
+            ),
+            'complement_nb': (
+                ComplementNB(),
+                {'alpha': [0.1, 0.5, 1.0]}
+            )
+        }
+
+        unknown = [family for family in self.model_families if family not in candidates]
+        if unknown:
+            raise ValueError(f'Unknown model families: {unknown}')
+
+        return {family: candidates[family] for family in self.model_families}
+
+    def measure_throughput(self, model, X, repeats=3):
+        """Measure batch inference throughput in reviews per second"""
+        best_time = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            model.predict_proba(X)
+            best_time = min(best_time, time.perf_counter() - start)
+        return X.shape[0] / best_time if best_time > 0 else float('inf')
+
+    def selection_score(self, accuracy, reviews_per_second):
+        """Combine CV accuracy and inference latency into one objective"""
+        ms_per_thousand = 1000 * 1000 / reviews_per_second
+        return accuracy - self.latency_weight * ms_per_thousand
+
     def train_model(self):
         """Train the sentiment analysis model"""
-        logging.info('Starting model training...')
+        self.logger.info('Starting model training...')
         try:
             # Split data
             X_train, X_test, y_train, y_test = train_test_split(
@@ -108,23 +181,38 @@ class ReviewAnalyzer:
             X_train_vectorized = self.vectorizer.fit_transform(X_train)
             X_test_vectorized = self.vectorizer.transform(X_test)
 
-            # Define hyperparameter grid for RandomForest
-            param_grid = {
-                'n_estimators': [100, 200],
-                'max_depth': [10, 20, None],
-                'min_samples_split': [2, 5],
-                'min_samples_leaf': [1, 2]
-            }
+            # Evaluate every candidate family with the same GridSearchCV loop
+            self.candidates = {}
+            searches = {}
+            for family, (estimator, param_grid) in self.get_candidate_models().items():
+                self.logger.info(f'Evaluating {family}...')
+                search = GridSearchCV(
+                    estimator,
+                    param_grid,
+                    cv=5,
+                    n_jobs=-1,
+                    verbose=1
+                )
+                search.fit(X_train_vectorized, y_train)
+                searches[family] = search
 
-            # Initialize and train model with GridSearchCV
-            self.model = GridSearchCV(
-                RandomForestClassifier(random_state=42),
-                param_grid,
-                cv=5,
-                n_jobs=-1,
-                verbose=1
-            )
-            self.model.fit(X_train_vectorized, y_train)
+                reviews_per_second = self.measure_throughput(search.best_estimator_, X_test_vectorized)
+                self.candidates[family] = {
+                    'model_type': search.best_estimator_.__class__.__name__,
+                    'best_params': search.best_params_,
+                    'best_score': search.best_score_,
+                    'test_accuracy': search.best_estimator_.score(X_test_vectorized, y_test),
+                    'inference_reviews_per_second': reviews_per_second,
+                    'selection_score': self.selection_score(search.best_score_, reviews_per_second)
+                }
+                self.logger.info(
+                    f'{family}: cv accuracy {search.best_score_:.4f}, '
+                    f'{reviews_per_second:.0f} reviews/sec'
+                )
+
+            self.selected_family = max(self.candidates, key=lambda family: self.candidates[family]['selection_score'])
+            self.model = searches[self.selected_family]
+            self.logger.info(f'Selected model family: {self.selected_family}')
 
             # Get best model
             best_model = self.model.best_estimator_
@@ -138,23 +226,23 @@ class ReviewAnalyzer:
                 'classification_report': classification_report(y_test, best_model.predict(X_test_vectorized), output_dict=True)
             }
 
-            logging.info('Model training completed successfully')
+            self.logger.info('Model training completed successfully')
             self.save_model_artifacts(X_train_vectorized)
             
         except Exception as e:
-            logging.error(f'Error in model training: {str(e)}')
+            self.logger.error(f'Error in model training: {str(e)}')
             raise
 
     def save_model_artifacts(self, X_train_vectorized):
         """Save model and related artifacts"""
-        logging.info('Saving model artifacts...')
+        self.logger.info('Saving model artifacts...')
         try:
             # Save model
-            with open('model/sentiment_model.pkl', 'wb') as f:
+            with open(f'{self.model_dir}sentiment_model.pkl', 'wb') as f:
                 pickle.dump(self.model.best_estimator_, f)
 
             # Save vectorizer
-            with open('model/vectorizer.pkl', 'wb') as f:
+            with open(f'{self.model_dir}vectorizer.pkl', 'wb') as f:
                 pickle.dump(self.vectorizer, f)
 
             # Convert non-serializable types to serializable format
@@ -185,6 +273,25 @@ class ReviewAnalyzer:
                         for key, inner_dict in self.training_metrics['classification_report'].items()
                     }
                 },
+                'model_selection': {
+                    'selected_family': self.selected_family,
+                    'latency_weight': self.latency_weight,
+                    'candidates': {
+                        family: {
+                            'model_type': candidate['model_type'],
+                            'best_params': {
+                                key: str(value) if not isinstance(value, (int, float, bool, str, list, dict))
+                                else value
+                                for key, value in candidate['best_params'].items()
+                            },
+                            'best_score': float(candidate['best_score']),
+                            'test_accuracy': float(candidate['test_accuracy']),
+                            'inference_reviews_per_second': float(candidate['inference_reviews_per_second']),
+                            'selection_score': float(candidate['selection_score'])
+                        }
+                        for family, candidate in self.candidates.items()
+                    }
+                },
                 'preprocessing_steps': [
                     'lowercase',
                     'tokenization',
@@ -194,24 +301,29 @@ class ReviewAnalyzer:
             }
 
             # Save metadata
-            with open('model/metadata/model_info.json', 'w') as f:
+            with open(f'{self.model_dir}metadata/model_info.json', 'w') as f:
                 json.dump(metadata, f, indent=2)
+            self.metadata = metadata
 
-            logging.info('Model artifacts saved successfully')
+            self.logger.info('Model artifacts saved successfully')
             
         except Exception as e:
-            logging.error(f'Error saving model artifacts: {str(e)}')
+            self.logger.error(f'Error saving model artifacts: {str(e)}')
             raise
 
     def validate_model(self):
         """Validate the saved model with test cases"""
-        logging.info('Starting model validation...')
+        self.logger.info('Starting model validation...')
         try:
-            # Load saved model components
-            with open('model/sentiment_model.pkl', 'rb') as f:
-                loaded_model = pickle.load(f)
-            with open('model/vectorizer.pkl', 'rb') as f:
-                loaded_vectorizer = pickle.load(f)
+            # Use the model trained in this process, falling back to the saved artifacts
+            if hasattr(self, 'model'):
+                loaded_model = self.model.best_estimator_
+                loaded_vectorizer = self.vectorizer
+            else:
+                with open(f'{self.model_dir}sentiment_model.pkl', 'rb') as f:
+                    loaded_model = pickle.load(f)
+                with open(f'{self.model_dir}vectorizer.pkl', 'rb') as f:
+                    loaded_vectorizer = pickle.load(f)
 
             # Test cases
             test_cases = [
@@ -242,7 +354,7 @@ class ReviewAnalyzer:
                 validation_results.append(result)
 
             # Save validation results
-            with open('model/validation/validation_results.json', 'w') as f:
+            with open(f'{self.model_dir}validation/validation_results.json', 'w') as f:
                 json.dump({
                     'timestamp': datetime.now().isoformat(),
                     'test_cases': validation_results,
@@ -253,10 +365,10 @@ class ReviewAnalyzer:
                     }
                 }, f, indent=2)
 
-            logging.info('Model validation completed successfully')
+            self.logger.info('Model validation completed successfully')
             
         except Exception as e:
-            logging.error(f'Error in model validation: {str(e)}')
+            self.logger.error(f'Error in model validation: {str(e)}')
             raise
 
 def main():
@@ -274,10 +386,10 @@ def main():
         # Validate model
         analyzer.validate_model()
         
-        logging.info('Review analyzer pipeline completed successfully')
+        analyzer.logger.info('Review analyzer pipeline completed successfully')
         
     except Exception as e:
-        logging.error(f'Pipeline failed: {str(e)}')
+        logging.getLogger(__name__).error(f'Pipeline failed: {str(e)}')
         raise
 
 if __name__ == "__main__":
@@ -9,9 +9,16 @@ from datetime import datetime
 class ModelValidator:
     """Enhanced validation suite for the sentiment analysis model"""
     
-    def __init__(self, model_path='model/'):
+    def __init__(self, model_path='model/', model=None, vectorizer=None, model_info=None):
         self.model_path = model_path
-        self.load_components()
+        self.stop_words = set(stopwords.words('english'))
+        if model is None or vectorizer is None or model_info is None:
+            self.load_components()
+        else:
+            # Components handed over in memory, e.g. straight from training
+            self.model = model
+            self.vectorizer = vectorizer
+            self.model_info = model_info
         self.setup_validation_cases()
         
     def load_components(self):
@@ -174,15 +181,19 @@ class ModelValidator:
         """Preprocess text using saved parameters"""
         text = str(text).lower()
         words = word_tokenize(text)
-        stop_words = set(stopwords.words('english'))
-        words = [word for word in words if word.isalpha() and word not in stop_words]
+        words = [word for word in words if word.isalpha() and word not in self.stop_words]
         return ' '.join(words)
 
-def run_validation():
+def run_validation(validator=None):
     """Run the complete validation suite"""
-    validator = ModelValidator()
+    if validator is None:
+        validator = ModelValidator()
     results = validator.run_comprehensive_validation()
-    
+    print_validation_summary(results)
+    return results
+
+def print_validation_summary(results):
+    """Print the headline validation metrics"""
     print("\nValidation Summary:")
     print("-" * 50)
     